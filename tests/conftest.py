@@ -0,0 +1,102 @@
+"""Load ``volt-parser/`` as ``volt_parser`` with the NLP stack stubbed out.
+
+The tests cover pure logic (dedup, chunking, HTTP helpers), so spaCy is
+replaced by a tiny fake and the transformer model is never loaded. torch is
+only stubbed when it is not installed.
+"""
+from __future__ import annotations
+import contextlib
+import importlib.util
+import os
+import re
+import sys
+import tempfile
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# cache.py opens ~/.cache/volt_parser/cache.sqlite at import.
+os.environ["HOME"] = tempfile.mkdtemp(prefix="volt-parser-tests-")
+
+_SENT_RE = re.compile(r"\S.*?(?:[.!?](?:\s+|$)|$)", re.DOTALL)
+
+
+class FakeSpan:
+    def __init__(self, text: str, label: str = "ORG"):
+        self.text = text
+        self.text_with_ws = text
+        self.label_ = label
+
+
+class FakeDoc:
+    def __init__(self, text: str):
+        self.text = text
+        # "Organisations" are capitalised words, enough to test the plumbing.
+        self.ents = [FakeSpan(m.group()) for m in re.finditer(r"\b[A-Z]\w+", text)]
+        self.sents = [FakeSpan(m.group()) for m in _SENT_RE.finditer(text)]
+
+
+class FakeNLP:
+    meta = {"lang": "en", "name": "core_web_trf", "version": "0.0.0"}
+
+    def __init__(self):
+        self.calls = []
+
+    def add_pipe(self, *args, **kwargs):
+        return None
+
+    def __call__(self, text: str) -> FakeDoc:
+        return FakeDoc(text)
+
+    def pipe(self, items, *, as_tuples=False, n_process=1, batch_size=1):
+        self.calls.append({"n_process": n_process, "batch_size": batch_size})
+        for item in items:
+            if as_tuples:
+                text, context = item
+                yield FakeDoc(text), context
+            else:
+                yield FakeDoc(item)
+
+
+def _stub_spacy() -> None:
+    spacy = types.ModuleType("spacy")
+    spacy.prefer_gpu = lambda: False
+    spacy.load = lambda *args, **kwargs: FakeNLP()
+    spacy.blank = lambda *args, **kwargs: FakeNLP()
+    sys.modules["spacy"] = spacy
+
+    thinc = types.ModuleType("thinc")
+    thinc_api = types.ModuleType("thinc.api")
+    thinc_api.set_gpu_allocator = lambda *args, **kwargs: None
+    thinc.api = thinc_api
+    sys.modules["thinc"] = thinc
+    sys.modules["thinc.api"] = thinc_api
+
+
+def _stub_torch() -> None:
+    if importlib.util.find_spec("torch") is not None:
+        return
+    torch = types.ModuleType("torch")
+    torch.inference_mode = contextlib.nullcontext
+    state = {"threads": os.cpu_count() or 1}
+    torch.get_num_threads = lambda: state["threads"]
+    torch.set_num_threads = lambda n: state.update(threads=n)
+    torch.nn = types.SimpleNamespace(Module=object)
+    sys.modules["torch"] = torch
+
+
+def _load_package() -> None:
+    spec = importlib.util.spec_from_file_location(
+        "volt_parser",
+        ROOT / "volt-parser" / "__init__.py",
+        submodule_search_locations=[str(ROOT / "volt-parser")],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["volt_parser"] = module
+    spec.loader.exec_module(module)
+
+
+_stub_spacy()
+_stub_torch()
+_load_package()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+from volt_parser.cache import Cache
+
+
+def test_memory_lru_evicts_least_recently_used(tmp_path):
+    cache = Cache(tmp_path / "cache.sqlite", memory_size=2)
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}  # "a" is now most recent
+    cache.set("c", {"v": 3})
+    assert list(cache._memory) == ["a", "c"]
+
+
+def test_get_falls_back_to_sqlite(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    Cache(path).set("url", {"search": ["Q1"]})
+    fresh = Cache(path, memory_size=2)
+    assert fresh._memory == {}
+    assert fresh.get("url") == {"search": ["Q1"]}
+    assert "url" in fresh._memory
+    assert fresh.get("missing") is None
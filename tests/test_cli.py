@@ -0,0 +1,65 @@
+from __future__ import annotations
+import asyncio
+import orjson
+from volt_parser import cli
+from volt_parser.enrichers import EnrichmentError
+
+
+def _profile(name: str) -> dict:
+    return {
+        "name": name,
+        "aliases": [],
+        "website": f"https://{name.lower()}.example",
+        "sector": "Mining",
+        "hq_location": "Perth",
+        "description": f"{name} digs things up.",
+        "key_people": [],
+        "competitors": [],
+        "sources": {},
+    }
+
+
+def _fake_enrich(failing: set[str]):
+    async def enrich_company(name: str, *, use_llm: bool = False) -> dict:
+        await asyncio.sleep(0)
+        if name in failing:
+            raise EnrichmentError(f"no data for {name!r}")
+        return _profile(name)
+
+    return enrich_company
+
+
+def _jsonl(path) -> list[dict]:
+    return [orjson.loads(line) for line in path.read_bytes().splitlines()]
+
+
+def test_gather_streams_jsonl_when_the_tail_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "enrich_company", _fake_enrich({"Delta"}))
+    output = tmp_path / "out.json"
+    table = asyncio.run(cli._gather(["Alpha", "Beta", "Gamma", "Delta"], use_llm=False, output=output, jsonl=True))
+    assert table.name == ["Alpha", "Beta", "Gamma"]
+    assert [p["name"] for p in orjson.loads(output.read_bytes())] == table.name
+    assert _jsonl(output.with_suffix(".jsonl")) == table.to_records()
+
+
+def test_gather_writes_empty_jsonl_when_everything_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(cli, "enrich_company", _fake_enrich({"Alpha", "Beta"}))
+    output = tmp_path / "out.json"
+    table = asyncio.run(cli._gather(["Alpha", "Beta"], use_llm=False, output=output, jsonl=True))
+    assert len(table) == 0
+    assert orjson.loads(output.read_bytes()) == []
+    assert output.with_suffix(".jsonl").read_bytes() == b""
+
+
+def test_gather_skips_invalid_profiles(tmp_path, monkeypatch):
+    async def enrich_company(name: str, *, use_llm: bool = False) -> dict:
+        profile = _profile(name)
+        if name == "Beta":
+            del profile["sector"]
+        return profile
+
+    monkeypatch.setattr(cli, "enrich_company", enrich_company)
+    output = tmp_path / "out.json"
+    table = asyncio.run(cli._gather(["Alpha", "Beta"], use_llm=False, output=output, jsonl=False))
+    assert table.name == ["Alpha"]
+    assert not output.with_suffix(".jsonl").exists()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+import asyncio
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import httpx
+import pytest
+from volt_parser import enrichers
+
+
+def _response(status: int, **headers: str) -> httpx.Response:
+    return httpx.Response(status, headers=headers)
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_retry_after_seconds(status):
+    assert enrichers._retry_after(_response(status, **{"Retry-After": "7"})) == 7.0
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = enrichers._retry_after(_response(429, **{"Retry-After": format_datetime(when, usegmt=True)}))
+    assert 25 <= delay <= 30
+
+
+def test_retry_after_date_in_the_past_is_zero():
+    when = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert enrichers._retry_after(_response(429, **{"Retry-After": format_datetime(when, usegmt=True)})) == 0.0
+
+
+@pytest.mark.parametrize(
+    "resp",
+    [
+        _response(429),
+        _response(429, **{"Retry-After": "soon"}),
+        _response(500, **{"Retry-After": "7"}),
+    ],
+)
+def test_retry_after_ignored(resp):
+    assert enrichers._retry_after(resp) is None
+
+
+def test_fetch_json_retries_after_rate_limit(monkeypatch):
+    statuses = iter([429, 200])
+
+    def handler(request):
+        status = next(statuses)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"ok": True})
+
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(enrichers, "_client", lambda: client)
+        try:
+            return await enrichers._fetch_json("https://example.test/rate-limited")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == {"ok": True}
+
+
+def test_fetch_json_coalesces_concurrent_requests(monkeypatch):
+    calls = []
+
+    async def fake_get_json(url):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"url": url}
+
+    monkeypatch.setattr(enrichers, "_get_json", fake_get_json)
+
+    async def run():
+        return await asyncio.gather(
+            *(enrichers._fetch_json("https://a") for _ in range(5)),
+            enrichers._fetch_json("https://b"),
+        )
+
+    results = asyncio.run(run())
+    assert results == [{"url": "https://a"}] * 5 + [{"url": "https://b"}]
+    assert sorted(calls) == ["https://a", "https://b"]
+    assert enrichers._INFLIGHT == {}
+
+
+def test_fetch_json_propagates_errors_to_waiters(monkeypatch):
+    calls = []
+
+    async def fake_get_json(url):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        raise enrichers.EnrichmentError(f"GET {url} → 500")
+
+    monkeypatch.setattr(enrichers, "_get_json", fake_get_json)
+
+    async def run():
+        return await asyncio.gather(
+            *(enrichers._fetch_json("https://boom") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(r, enrichers.EnrichmentError) for r in results)
+    assert enrichers._INFLIGHT == {}
+
+
+def test_fetch_json_owner_cancellation_hands_over_to_waiters(monkeypatch):
+    calls = []
+
+    async def fake_get_json(url):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"n": len(calls)}
+
+    monkeypatch.setattr(enrichers, "_get_json", fake_get_json)
+
+    async def run():
+        owner = asyncio.create_task(enrichers._fetch_json("https://slow"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(enrichers._fetch_json("https://slow")) for _ in range(2)]
+        await asyncio.sleep(0)
+        owner.cancel()
+        return owner, await asyncio.gather(*waiters)
+
+    owner, results = asyncio.run(run())
+    assert owner.cancelled()
+    assert results == [{"n": 2}, {"n": 2}]
+    assert len(calls) == 2
+    assert enrichers._INFLIGHT == {}
+
+
+def test_client_is_rebuilt_for_a_new_event_loop():
+    async def grab():
+        return enrichers._client()
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+    assert first is not second
+
+
+def test_client_from_a_running_loop_is_closed_on_rebuild():
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        async def grab():
+            return enrichers._client()
+
+        first = asyncio.run_coroutine_threadsafe(grab(), other).result(5)
+
+        async def rebuild():
+            second = enrichers._client()
+            await enrichers.close_client()
+            return second
+
+        second = asyncio.run(rebuild())
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other).result(5)
+        assert first is not second
+        assert first.is_closed and second.is_closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join(5)
+        other.close()
+
+
+def test_loads_lenient_ignores_trailing_text():
+    raw = 'Here you go: {"website": "https://acme.example"} Note: {x}'
+    assert enrichers._loads_lenient(raw, raw.find("{")) == {"website": "https://acme.example"}
+
+
+def test_loads_lenient_quotes_bare_values():
+    raw = '{"sector": Mining Corp, "hq_location": "Perth"}'
+    assert enrichers._loads_lenient(raw, 0) == {"sector": "Mining Corp", "hq_location": "Perth"}
+
+
+@pytest.mark.skipif(enrichers.pyjson5 is None, reason="pyjson5 not installed")
+def test_loads_lenient_accepts_json5():
+    raw = "{'website': 'https://acme.example', // guessed\n}"
+    assert enrichers._loads_lenient(raw, 0) == {"website": "https://acme.example"}
+
+
+def test_loads_lenient_without_pyjson5(monkeypatch):
+    monkeypatch.setattr(enrichers, "pyjson5", None)
+    assert enrichers._loads_lenient('{"sector": Mining Corp,}', 0) == {"sector": "Mining Corp"}
+    assert enrichers._loads_lenient("no json here {", 13) is None
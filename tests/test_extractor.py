@@ -0,0 +1,130 @@
+from __future__ import annotations
+import types
+import pytest
+from volt_parser import extractor
+
+
+@pytest.mark.parametrize(
+    "candidates, expected",
+    [
+        ([], []),
+        (["Lynas"], ["Lynas"]),
+        (["MP Materials", "MP Materials.", "mp materials"], ["MP Materials"]),
+        (["Lynas Rare Earths", "Lynas"], ["Lynas Rare Earths"]),
+        (["Lynas", "Lynas Rare Earths"], ["Lynas"]),
+        (["Phoenix Tailings", "Phoenix Tailing"], ["Phoenix Tailings"]),
+        (["Lynas’", "Lynas'"], ["Lynas’"]),
+    ],
+)
+def test_dedupe_companies(candidates, expected):
+    assert extractor.dedupe_companies(candidates) == expected
+
+
+@pytest.mark.parametrize(
+    "candidates, expected",
+    [
+        (["Alpha Beta", "Alpha", "Beta", "Beta Gamma"], ["Alpha Beta", "Beta Gamma"]),
+        (["Apple Inc", "Apple", "Apple Records"], ["Apple Inc", "Apple Records"]),
+    ],
+)
+def test_dedupe_companies_does_not_chain_through_dropped_names(candidates, expected):
+    assert extractor.dedupe_companies(candidates) == expected
+
+
+def test_dedupe_companies_merges_fuzzy_components():
+    names = ["Rio Tinto Group", "Rio Tinto Grup", "Rio Tinto Gruop", "Glencore"]
+    assert extractor.dedupe_companies(names) == ["Rio Tinto Group", "Glencore"]
+
+
+def test_extract_companies_many_defaults_to_one_process(monkeypatch):
+    monkeypatch.setattr(extractor, "_nlp", extractor._nlp.__class__())
+    list(extractor.extract_companies_many(["Acme."]))
+    assert extractor._nlp.calls[-1]["n_process"] == 1
+
+
+def test_extract_companies_many_caps_torch_threads_for_workers(monkeypatch):
+    seen = {}
+    nlp = extractor._nlp.__class__()
+    real_pipe = nlp.pipe
+
+    def pipe(items, **kwargs):
+        seen["threads"] = extractor.torch.get_num_threads()
+        seen["env"] = extractor.os.environ.get("VOLT_TORCH_THREADS")
+        return real_pipe(items, **kwargs)
+
+    nlp.pipe = pipe
+    monkeypatch.setattr(extractor, "_nlp", nlp)
+    monkeypatch.setattr(extractor.os, "cpu_count", lambda: 8)
+    before = extractor.torch.get_num_threads()
+    list(extractor.extract_companies_many(["Acme."], n_process=4))
+    assert seen == {"threads": 2, "env": "2"}
+    assert extractor.torch.get_num_threads() == before
+    assert "VOLT_TORCH_THREADS" not in extractor.os.environ
+
+
+def test_chunks_group_sentences_up_to_budget(monkeypatch):
+    monkeypatch.setattr(extractor, "_CHUNK_TOKENS", 5)
+    text = "Acme builds. Beta sells things to people. Gamma. Delta too."
+    assert extractor._chunks(text) == [
+        "Acme builds. ",
+        "Beta sells things to people. ",
+        "Gamma. Delta too.",
+    ]
+
+
+def test_chunks_keep_oversized_sentence_whole(monkeypatch):
+    monkeypatch.setattr(extractor, "_CHUNK_TOKENS", 1)
+    text = "A very long sentence that exceeds the budget."
+    assert extractor._chunks(text) == [text]
+
+
+def test_chunks_of_blank_text_are_empty():
+    assert extractor._chunks("") == []
+    assert extractor._chunks("   \n ") == []
+
+
+def test_extract_companies_many_aligns_results_with_inputs(monkeypatch):
+    monkeypatch.setattr(extractor, "_CHUNK_TOKENS", 3)
+    texts = [
+        "",
+        "Acme builds. Beta sells things to people. Acme again.",
+        "   ",
+        "See [Zed](https://zed.example).",
+        "",
+    ]
+    assert list(extractor.extract_companies_many(texts)) == [
+        [],
+        ["Acme", "Beta"],
+        [],
+        ["See", "Zed"],
+        [],
+    ]
+
+
+def test_extract_companies_many_of_no_texts_yields_nothing():
+    assert list(extractor.extract_companies_many([])) == []
+
+
+def test_extract_companies_dedupes_across_chunks(monkeypatch):
+    monkeypatch.setattr(extractor, "_CHUNK_TOKENS", 3)
+    text = "MP Materials grows. Lynas too. MP Materials again."
+    assert extractor.extract_companies(text) == ["MP", "Materials", "Lynas"]
+
+
+@pytest.mark.parametrize("name", ["IBM", "IBM.", "IBM,\t", "ibm ", "IBM. ", " IBM　"])
+def test_normalize_strips_unicode_whitespace_and_punctuation(name):
+    assert extractor._normalize(name) == "ibm"
+
+
+@pytest.mark.parametrize(
+    ("module", "kernel"),
+    [
+        ("rapidfuzz.fuzz_cpp_avx2", "avx2"),
+        ("rapidfuzz.fuzz_cpp", "cpp"),
+        ("rapidfuzz.fuzz_py", "pure-python"),
+    ],
+)
+def test_rapidfuzz_kernel_label(monkeypatch, module, kernel):
+    ratio = types.SimpleNamespace(__module__=module)
+    monkeypatch.setattr(extractor, "fuzz", types.SimpleNamespace(ratio=ratio))
+    assert extractor._rapidfuzz_kernel() == kernel
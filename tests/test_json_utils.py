@@ -0,0 +1,73 @@
+from __future__ import annotations
+import asyncio
+import orjson
+import pytest
+from jsonschema import ValidationError
+from volt_parser import json_utils
+
+
+def _profile(**overrides) -> dict:
+    profile = {
+        "name": "Acme",
+        "aliases": ["ACME Corp"],
+        "website": "https://acme.example",
+        "sector": "Mining",
+        "hq_location": "Perth",
+        "description": "Acme digs things up.",
+        "key_people": [{"name": "Jane Doe", "role": "CEO"}],
+        "competitors": [{"name": "Globex"}],
+        "sources": {"wikidata": "Q1"},
+    }
+    profile.update(overrides)
+    return profile
+
+
+def test_validate_profile_ignores_uri_format():
+    json_utils.validate_profile(_profile(website="Unknown"))
+    if json_utils._FAST_VALIDATE is not None:
+        json_utils._FAST_VALIDATE([_profile(website="Unknown")])
+
+
+def test_validate_profile_rejects_missing_fields():
+    profile = _profile()
+    del profile["sector"]
+    with pytest.raises(ValidationError):
+        json_utils.validate_profile(profile)
+
+
+def test_company_table_round_trips_records():
+    table = json_utils.CompanyTable()
+    profiles = [_profile(), _profile(name="Globex", aliases=[], sources={})]
+    for profile in profiles:
+        table.append(profile)
+    assert len(table) == 2
+    assert table.to_records() == profiles
+    assert table.to_records(1) == profiles[1:]
+
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = json_utils.CompanyTable()
+    table.append(_profile())
+    json_utils.write_parquet(table, tmp_path / "out.parquet")
+    assert pq.read_table(tmp_path / "out.parquet").to_pylist() == table.to_records()
+
+
+def test_write_parquet_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_utils, "pa", None)
+    monkeypatch.setattr(json_utils, "pq", None)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        json_utils.write_parquet(json_utils.CompanyTable(), tmp_path / "out.parquet")
+
+
+def test_jsonl_stream_appends_lines(tmp_path):
+    async def run(stream):
+        assert not stream.started
+        await stream.write([{"a": 1}])
+        assert stream.started
+        await stream.write([{"b": 2}, {"c": 3}])
+        await stream.aclose()
+
+    path = tmp_path / "out.jsonl"
+    asyncio.run(run(json_utils.JsonlStream(path)))
+    assert [orjson.loads(line) for line in path.read_bytes().splitlines()] == [{"a": 1}, {"b": 2}, {"c": 3}]
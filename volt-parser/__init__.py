@@ -1,9 +1,12 @@
 __all__ = [
     "extract_companies",
+    "extract_companies_batch",
+    "extract_companies_many",
     "enrich_company",
+    "close_client",
     "generate_json",
 ]
 
-from .extractor import extract_companies
-from .enrichers import enrich_company
+from .extractor import extract_companies, extract_companies_batch, extract_companies_many
+from .enrichers import close_client, enrich_company
 from .json_utils import generate_json
\ No newline at end of file
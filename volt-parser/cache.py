@@ -1,34 +1,61 @@
 from __future__ import annotations
 import sqlite3
+from collections import OrderedDict
 from pathlib import Path
-import json
+import orjson
 from typing import Any, Optional
 
 CACHE_PATH = Path.home() / ".cache" / "volt_parser" / "cache.sqlite"
 CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
 
 class Cache:
 
-    def __init__(self, path: Path = CACHE_PATH):
-        self.conn = sqlite3.connect(path)
+    def __init__(self, path: Path = CACHE_PATH, memory_size: int = 1024):
+        # Autocommit: each write is its own WAL transaction, no explicit commit().
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        for pragma in _PRAGMAS:
+            self.conn.execute(pragma)
         self.conn.execute(
             """CREATE TABLE IF NOT EXISTS kv (
             k TEXT PRIMARY KEY,
-            v TEXT NOT NULL,
+            v BLOB NOT NULL,
             ts DATETIME DEFAULT CURRENT_TIMESTAMP)"""
         )
-        self.conn.commit()
+        # Small in-process LRU so repeated lookups within a run skip SQLite.
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._memory_size = memory_size
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
 
     def get(self, key: str) -> Optional[Any]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
         row = self.conn.execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
-        return json.loads(row[0]) if row else None
+        if not row:
+            return None
+        value = orjson.loads(row[0])
+        self._remember(key, value)
+        return value
 
     def set(self, key: str, value: Any):
         self.conn.execute(
             "REPLACE INTO kv (k, v) VALUES (?, ?)",
-            (key, json.dumps(value, ensure_ascii=False)),
+            (key, orjson.dumps(value)),
         )
-        self.conn.commit()
+        self._remember(key, value)
 
 CACHE = Cache()
@@ -7,13 +7,17 @@ import sys
 from importlib import util as importlib_util
 from pathlib import Path
 import click
+from jsonschema import ValidationError
 from rich.console import Console
-from .extractor import extract_companies
-from .enrichers import enrich_company, EnrichmentError
-from .json_utils import write_json
+from .extractor import dedupe_companies, extract_companies_many
+from .enrichers import close_client, enrich_company, EnrichmentError
+from .json_utils import CompanyTable, JsonlStream, awrite_json, validate_profile, write_json, write_parquet
 
 console = Console()
 
+# Share of enrichment tasks that must be done before partial results are streamed.
+_STREAM_AFTER = 0.75
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -29,6 +33,43 @@ def _anthropic_ready() -> bool:
         and bool(os.getenv("ANTHROPIC_API_KEY"))
     )
 
+async def _gather(names: list[str], *, use_llm: bool, output: Path, jsonl: bool) -> CompanyTable:
+    """Enrich *names* concurrently, then write the JSON output.
+
+    With *jsonl*, valid profiles also go to ``<output>.jsonl``: nothing until
+    more than ``_STREAM_AFTER`` of the tasks are done, then everything
+    collected so far and each later profile as soon as it is awaited. The file
+    is always written, even if every remaining task fails.
+    """
+    stream = JsonlStream(output.with_suffix(".jsonl")) if jsonl else None
+    written = 0
+    try:
+        tasks = [asyncio.create_task(enrich_company(n, use_llm=use_llm)) for n in names]
+        enriched = CompanyTable()
+        for t in tasks:
+            try:
+                profile = await t
+                validate_profile(profile)
+            except EnrichmentError as exc:
+                console.print(f"[red]Skip[/] {exc}")
+            except ValidationError as exc:
+                console.print(f"[red]Skip[/] '{profile.get('name')}': {exc.message}")
+            else:
+                enriched.append(profile)
+            if stream is None or len(enriched) == written:
+                continue
+            if stream.started or sum(task.done() for task in tasks) > _STREAM_AFTER * len(tasks):
+                await stream.write(enriched.to_records(written))
+                written = len(enriched)
+        if stream is not None:
+            await stream.write(enriched.to_records(written))
+        await awrite_json(enriched.to_records(), output)
+        return enriched
+    finally:
+        if stream is not None:
+            await stream.aclose()
+        await close_client()
+
 # ---------------------------------------------------------------------------
 # CLI definition
 # ---------------------------------------------------------------------------
@@ -38,13 +79,21 @@ def _anthropic_ready() -> bool:
 @click.option("--pretty", is_flag=True, help="Pretty‑print JSON to stdout as well")
 @click.option("--llm-fallback", is_flag=True, help="Use Anthropic Claude to guess website when missing (needs key)")
 @click.option("--suppress-warnings", is_flag=True, help="Hide spaCy/PyTorch warnings")
-def main(input_file: str, output: str, pretty: bool, llm_fallback: bool, suppress_warnings: bool):
+@click.option("--parquet", is_flag=True, help="Also write a zstd Parquet file next to the JSON (needs pyarrow)")
+@click.option("--jsonl", is_flag=True, help="Stream partial results to a .jsonl file next to the JSON")
+@click.option("--processes", default=1, show_default=True, type=click.IntRange(min=1),
+              help="spaCy worker processes for CPU NER (each loads its own model copy)")
+def main(input_file: str, output: str, pretty: bool, llm_fallback: bool, suppress_warnings: bool, parquet: bool, jsonl: bool, processes: int):
     if suppress_warnings:
         _silence_warnings()
     
     if llm_fallback and not _anthropic_ready():
         console.print("[red]LLM fallback requested, but Anthropic lib or API key not found.[/]")
         sys.exit(1)
+
+    if parquet and importlib_util.find_spec("pyarrow") is None:
+        console.print("[red]Parquet output requested, but pyarrow is not installed.[/]")
+        sys.exit(1)
     
     if input_file == "-":
         text = sys.stdin.read()
@@ -54,8 +103,12 @@ def main(input_file: str, output: str, pretty: bool, llm_fallback: bool, suppres
             console.print(f"[red]File not found:[/] {path}")
             sys.exit(1)
         text = path.read_text(encoding="utf-8")
+
+    # Notes pasted from cp1252-decoded sources carry "’" as mojibake; fix it once here.
+    text = text.replace("\u00e2\u20ac\u2122", "’")
     
-    names = extract_companies(text)
+    paragraphs = [p for p in text.split("\n\n") if p.strip()]
+    names = dedupe_companies(n for batch in extract_companies_many(paragraphs, n_process=processes) for n in batch)
     if not names:
         console.print("[yellow]No companies detected — writing empty list[/]")
         write_json([], Path(output))
@@ -63,19 +116,14 @@ def main(input_file: str, output: str, pretty: bool, llm_fallback: bool, suppres
     
     console.print(f"Detected [bold]{len(names)}[/] companies: {', '.join(names)}")
     
-    async def _gather() -> list[dict]:
-        tasks = [asyncio.create_task(enrich_company(n, use_llm=llm_fallback)) for n in names]
-        enriched = []
-        for t in tasks:
-            try:
-                enriched.append(await t)
-            except EnrichmentError as exc:
-                console.print(f"[red]Skip[/] {exc}")
-        return enriched
-    
-    data = asyncio.run(_gather())
-    write_json(data, Path(output))
+    table = asyncio.run(_gather(names, use_llm=llm_fallback, output=Path(output), jsonl=jsonl))
+    data = table.to_records()
     console.print(f"[green]JSON written → {output}")
+
+    if parquet:
+        parquet_path = Path(output).with_suffix(".parquet")
+        write_parquet(table, parquet_path)
+        console.print(f"[green]Parquet written → {parquet_path}")
     
     if pretty:
         console.print_json(json.dumps(data, ensure_ascii=False, indent=2))
@@ -3,9 +3,12 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from urllib.parse import quote_plus
-import aiohttp
+import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, RetryError
 from rich.console import Console
 from .cache import CACHE
@@ -19,6 +22,14 @@ except ImportError:
 
     anthropic = None
 
+try:
+
+    import pyjson5
+
+except ImportError:
+
+    pyjson5 = None
+
 
 console = Console()
 
@@ -28,66 +39,295 @@ HEADERS = {
 
     "Accept": "application/json",
 
+    # WikiData JSON is highly repetitive; compressed bodies are 5-10× smaller.
+    "Accept-Encoding": "gzip, br",
+
 }
 
 
 ANTHROPIC_KEY = os.getenv("ANTHROPIC_API_KEY")
 
+# Last-resort repair for the LLM reply: unquoted values, trailing commas.
+_QUOTE_FIX_RE = re.compile(r'(".*?"\s*:\s*)([^"\{\[\d\-\s][^,\n}]*)')
+
+_TRAIL_COMMA_RE = re.compile(r',\s*([}\]])')
+
+_URL_RE = re.compile(r'https?://[^\s"\'\\]+')
+
+
+# One pooled client for every WikiData/Wikipedia call: keep-alive connections
+# and HTTP/2 multiplexing instead of a fresh handshake per company.
+# The pool belongs to the event loop that created it, so a caller running
+# several asyncio.run() calls gets a fresh client per loop. Await close_client()
+# before each loop exits: a pool left behind by a finished loop cannot be
+# closed from another one, and its sockets are only released on GC.
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _discard(closer: Callable[[], Awaitable[Any]], loop: Optional[asyncio.AbstractEventLoop]) -> None:
+
+    """Best-effort close of a pool owned by another event loop."""
+
+    if loop is not None and loop.is_running() and not loop.is_closed():
+
+        asyncio.run_coroutine_threadsafe(closer(), loop)
+
+
+def _client() -> httpx.AsyncClient:
+
+    global _CLIENT, _CLIENT_LOOP
+
+    loop = asyncio.get_running_loop()
+
+    if _CLIENT is None or _CLIENT.is_closed or _CLIENT_LOOP is not loop:
+
+        if _CLIENT is not None and not _CLIENT.is_closed:
+
+            _discard(_CLIENT.aclose, _CLIENT_LOOP)
+
+        _CLIENT_LOOP = loop
+
+        _CLIENT = httpx.AsyncClient(
+
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+
+            http2=True,
+
+            timeout=15.0,
+
+            headers=HEADERS,
+
+        )
+
+    return _CLIENT
+
+
+# AsyncAnthropic owns an httpx pool too, so it follows the same per-loop rule.
+_ANTHROPIC: Optional[Any] = None
+
+_ANTHROPIC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _anthropic() -> Optional[Any]:
+
+    global _ANTHROPIC, _ANTHROPIC_LOOP
+
+    if not anthropic or not ANTHROPIC_KEY:
+
+        return None
+
+    loop = asyncio.get_running_loop()
+
+    if _ANTHROPIC is None or _ANTHROPIC_LOOP is not loop:
+
+        if _ANTHROPIC is not None:
+
+            _discard(_ANTHROPIC.close, _ANTHROPIC_LOOP)
+
+        _ANTHROPIC_LOOP = loop
+
+        _ANTHROPIC = anthropic.AsyncAnthropic(api_key=ANTHROPIC_KEY)
+
+    return _ANTHROPIC
+
+
+async def close_client() -> None:
+
+    """Close the shared HTTP pools; call once before the event loop exits."""
+
+    global _CLIENT, _CLIENT_LOOP, _ANTHROPIC, _ANTHROPIC_LOOP
+
+    loop = asyncio.get_running_loop()
+
+    if _CLIENT is not None and _CLIENT_LOOP is loop:
+
+        await _CLIENT.aclose()
+
+    elif _CLIENT is not None:
+
+        _discard(_CLIENT.aclose, _CLIENT_LOOP)
+
+    if _ANTHROPIC is not None and _ANTHROPIC_LOOP is loop:
+
+        await _ANTHROPIC.close()
+
+    elif _ANTHROPIC is not None:
+
+        _discard(_ANTHROPIC.close, _ANTHROPIC_LOOP)
+
+    _CLIENT = _ANTHROPIC = None
+
+    _CLIENT_LOOP = _ANTHROPIC_LOOP = None
+
 
 
 class EnrichmentError(Exception):
 
     """Raised when an unrecoverable enrichment problem occurs."""
 
+    def __init__(self, message: str, *, retry_after: Optional[float] = None):
+
+        super().__init__(message)
+
+        self.retry_after = retry_after
+
 
 # Cached HTTP GET w/ retry ---------------------------------------------------
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(1, 8), retry=retry_if_exception_type(EnrichmentError))
+_BACKOFF = wait_exponential(1, 8)
+
+_MAX_RETRY_AFTER = 30.0
+
+
+def _retry_after(resp: httpx.Response) -> Optional[float]:
+
+    """Seconds requested by a 429/503 ``Retry-After`` header, if any."""
+
+    value = resp.headers.get("Retry-After")
 
-async def _fetch_json(session: aiohttp.ClientSession, url: str) -> Any:
+    if resp.status_code not in (429, 503) or not value:
+
+        return None
+
+    if value.isdigit():
+
+        return float(value)
+
+    try:
+
+        when = parsedate_to_datetime(value)
+
+    except (TypeError, ValueError):
+
+        return None
+
+    if when.tzinfo is None:
+
+        when = when.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _wait(retry_state) -> float:
+
+    """Honour the server's Retry-After (capped), else back off exponentially."""
+
+    delay = getattr(retry_state.outcome.exception(), "retry_after", None)
+
+    if delay is not None:
+
+        return min(delay, _MAX_RETRY_AFTER)
+
+    return _BACKOFF(retry_state)
+
+
+@retry(stop=stop_after_attempt(3), wait=_wait, retry=retry_if_exception_type(EnrichmentError))
+
+async def _get_json(url: str) -> Any:
 
     if (cached := CACHE.get(url)) is not None:
 
         return cached
 
-    async with session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+    resp = await _client().get(url)
+
+    if resp.status_code != 200:
 
-        if resp.status != 200:
+        raise EnrichmentError(f"GET {url} → {resp.status_code}", retry_after=_retry_after(resp))
 
-            raise EnrichmentError(f"GET {url} → {resp.status}")
+    data = resp.json()
 
-        data = await resp.json()
+    CACHE.set(url, data)
 
-        CACHE.set(url, data)
+    return data
+
+
+# In-flight GETs keyed by URL: concurrent enrich_company tasks asking for the
+# same entity await one request instead of each hitting the cache/API.
+_INFLIGHT: Dict[str, asyncio.Future] = {}
+
+
+class _OwnerCancelled(Exception):
+
+    """Set on an in-flight future whose owning task was cancelled."""
+
+
+async def _fetch_json(url: str) -> Any:
+
+    # A cancelled owner must not cancel its waiters: the first one to wake up
+    # takes over the request instead.
+    while (pending := _INFLIGHT.get(url)) is not None:
+
+        try:
+
+            return await asyncio.shield(pending)
+
+        except _OwnerCancelled:
+
+            continue
+
+    fut = asyncio.get_running_loop().create_future()
+
+    _INFLIGHT[url] = fut
+
+    try:
+
+        data = await _get_json(url)
+
+    except asyncio.CancelledError:
+
+        fut.set_exception(_OwnerCancelled())
+
+        fut.exception()
+
+        raise
+
+    except Exception as exc:
+
+        fut.set_exception(exc)
+
+        fut.exception()  # mark retrieved: waiters are optional
+
+        raise
+
+    else:
+
+        fut.set_result(data)
 
         return data
 
+    finally:
+
+        del _INFLIGHT[url]
+
 
 # WikiData helpers -----------------------------------------------------------
 
-async def _wd_search(session: aiohttp.ClientSession, name: str) -> Optional[Dict[str, Any]]:
+async def _wd_search(name: str) -> Optional[Dict[str, Any]]:
 
     url = ("https://www.wikidata.org/w/api.php?action=wbsearchentities&search="
 
            + quote_plus(name) + "&language=en&format=json")
 
-    data = await _fetch_json(session, url)
+    data = await _fetch_json(url)
 
     return data.get("search", [None])[0] if data.get("search") else None
 
 
 
-async def _wd_entity(session: aiohttp.ClientSession, qid: str) -> Dict[str, Any]:
+async def _wd_entity(qid: str) -> Dict[str, Any]:
 
     url = f"https://www.wikidata.org/wiki/Special:EntityData/{qid}.json"
 
-    data = await _fetch_json(session, url)
+    data = await _fetch_json(url)
 
     return data["entities"][qid]
 
 
 
-async def _wd_first_claim_label(session: aiohttp.ClientSession, entity: Dict[str, Any], prop: str) -> Optional[str]:
+async def _wd_first_claim_label(entity: Dict[str, Any], prop: str) -> Optional[str]:
 
     claims = entity.get("claims", {})
 
@@ -107,7 +347,7 @@ async def _wd_first_claim_label(session: aiohttp.ClientSession, entity: Dict[str
 
     if isinstance(val, dict) and val.get("entity-type") == "item":
 
-        linked = await _wd_entity(session, "Q" + str(val["numeric-id"]))
+        linked = await _wd_entity("Q" + str(val["numeric-id"]))
 
         return linked.get("labels", {}).get("en", {}).get("value")
 
@@ -132,10 +372,10 @@ def _wrap_names(names: List[str]) -> List[Dict[str, str]]:
 
 
 # Wikipedia summary ----------------------------------------------------------
-async def _wiki_summary(session: aiohttp.ClientSession, title: str) -> str:
+async def _wiki_summary(title: str) -> str:
     url = f"https://en.wikipedia.org/api/rest_v1/page/summary/{quote_plus(title)}"
     try:
-        data = await _fetch_json(session, url)
+        data = await _fetch_json(url)
         return data.get("extract", "")
     except (EnrichmentError, RetryError):
 
@@ -144,12 +384,66 @@ async def _wiki_summary(session: aiohttp.ClientSession, title: str) -> str:
 
 # Anthropic Web-Search Tool ----------------------------------
 
-async def _anthropic_web_search(company: str) -> Optional[Dict[str, Any]]:
-    if not anthropic or not ANTHROPIC_KEY:
+_DECODER = json.JSONDecoder()
+
+
+def _repair(blob: str) -> str:
+
+    repaired = _QUOTE_FIX_RE.sub(
+
+        lambda m: m.group(1) + '"' + m.group(2).strip() + '"',
+
+        blob,
+
+    )
+
+    return _TRAIL_COMMA_RE.sub(r'\1', repaired)
+
+
+def _decode_first(blob: str) -> Any:
+
+    try:
+
+        return _DECODER.raw_decode(blob)[0]
+
+    except json.JSONDecodeError:
+
+        pass
+
+    if pyjson5 is None:
 
         return None
 
-    client = anthropic.Anthropic(api_key=ANTHROPIC_KEY)
+    try:
+
+        return pyjson5.decode(blob, some=True)
+
+    except pyjson5.Json5Exception:
+
+        return None
+
+
+def _loads_lenient(raw: str, start: int) -> Any:
+
+    """First JSON value at ``raw[start:]``; text after it (notes, stray braces) is ignored.
+
+    Strict JSON first, then pyjson5 for trailing commas, single quotes and comments,
+    then both again after quoting bare values such as ``{"sector": Mining Corp}``.
+    """
+
+    blob = raw[start:]
+
+    data = _decode_first(blob)
+
+    return data if data is not None else _decode_first(_repair(blob))
+
+
+async def _anthropic_web_search(company: str) -> Optional[Dict[str, Any]]:
+    client = _anthropic()
+
+    if client is None:
+
+        return None
 
     tool_def = {
 
@@ -182,9 +476,7 @@ async def _anthropic_web_search(company: str) -> Optional[Dict[str, Any]]:
 
     try:
 
-        resp = await asyncio.to_thread(
-
-            client.messages.create,
+        resp = await client.messages.create(
 
             model="claude-3-5-haiku-latest",
 
@@ -202,47 +494,20 @@ async def _anthropic_web_search(company: str) -> Optional[Dict[str, Any]]:
 
         console.log(f"Claude text: {raw}")
 
-        import re, json as _json
-
-        m = re.search(r'\{.*?\}', raw, re.DOTALL)
+        start = raw.find("{")
 
-        if not m:
+        if start == -1:
 
             return None
 
-        blob = m.group()
-
-        try:
-
-            return _json.loads(blob)
-
-        except _json.JSONDecodeError:
+        parsed = _loads_lenient(raw, start)
 
-            pass
+        if isinstance(parsed, dict):
 
+            return parsed
 
-        repaired = re.sub(
 
-            r'(".*?"\s*:\s*)([^"\{\[\d\-\s][^,\n}]*)',
-
-            lambda m: m.group(1) + '"' + m.group(2).strip() + '"',
-
-            blob,
-
-        )
-
-        repaired = re.sub(r',\s*([}\]])', r'\1', repaired)
-
-        try:
-
-            return _json.loads(repaired)
-
-        except Exception:
-
-            pass
-
-
-        url_match = re.search(r'https?://[^\s"\'\\]+', raw)
+        url_match = _URL_RE.search(raw)
 
         return {
 
@@ -269,133 +534,142 @@ async def _anthropic_web_search(company: str) -> Optional[Dict[str, Any]]:
 async def enrich_company(name: str, *, use_llm: bool = False) -> Dict[str, Any]:
     console.log(f"Starting enrichment for: '{name}' (LLM enabled: {use_llm})")
 
-    async with aiohttp.ClientSession() as session:
+    console.log("🔍 Searching WikiData...")
 
-        console.log("🔍 Searching WikiData...")
+    hit = await _wd_search(name)
 
-        hit = await _wd_search(session, name)
+    if not hit:
 
-        if not hit:
+        console.log("No WikiData entry found")
 
-            console.log("No WikiData entry found")
+        if use_llm:
 
-            if use_llm:
+            console.log("Attempting Anthropic web search...")
 
-                console.log("Attempting Anthropic web search...")
+            web_data = await _anthropic_web_search(name)
 
-                web_data = await _anthropic_web_search(name)
+            if web_data:
+
+                console.log(f"Web search found data for '{name}'")
+
+                key_people: List[str] = []
+                if isinstance(web_data.get("key_people"), list):
+                    for person in web_data["key_people"][:3]:
+                        if isinstance(person, dict) and "name" in person:
+                            key_people.append(str(person["name"]))
+                        elif isinstance(person, str):
+                            key_people.append(person.strip())
+                
+                competitors = [
+                    c.strip() for c in (web_data.get("competitors") or [])[:5]
+                    if isinstance(c, str) and c.strip()
+                ]
+               
+                return {
+                    "name": name,
+                    "aliases": [],
+                    "website": web_data.get("website") or "Unknown",
+                    "sector": web_data.get("sector") or "Unknown",
+                    "hq_location": web_data.get("hq_location") or "Unknown",
+                    "description": web_data.get("description") or "(found via web search)",
+                    "key_people": _wrap_names(key_people),      # ← schema-compliant
+                    "competitors": _wrap_names(competitors),    # same trick – name objects
+                    "sources": {"anthropic_web_search": "Anthropic Web Search Tool"},
+                }
 
-                if web_data:
+            else:
 
-                    console.log(f"Web search found data for '{name}'")
+                console.log("Web search also failed")
 
-                    key_people: List[str] = []
-                    if isinstance(web_data.get("key_people"), list):
-                        for person in web_data["key_people"][:3]:
-                            if isinstance(person, dict) and "name" in person:
-                                key_people.append(str(person["name"]))
-                            elif isinstance(person, str):
-                                key_people.append(person.strip())
-                    
-                    competitors = [
-                        c.strip() for c in (web_data.get("competitors") or [])[:5]
-                        if isinstance(c, str) and c.strip()
-                    ]
-                   
-                    return {
-                        "name": name,
-                        "aliases": [],
-                        "website": web_data.get("website", "Unknown"),
-                        "sector": web_data.get("sector", "Unknown"),
-                        "hq_location": web_data.get("hq_location", "Unknown"),
-                        "description": web_data.get("description", "(found via web search)"),
-                        "key_people": _wrap_names(key_people),      # ← schema-compliant
-                        "competitors": _wrap_names(competitors),    # same trick – name objects
-                        "sources": {"anthropic_web_search": "Anthropic Web Search Tool"},
-                    }
+        else:
 
-                else:
+            console.log("LLM fallback disabled")
 
-                    console.log("Web search also failed")
+        raise EnrichmentError(f"No Wikidata hit for '{name}'")
 
-            else:
 
-                console.log("LLM fallback disabled")
+    qid = hit["id"]
 
-            raise EnrichmentError(f"No Wikidata hit for '{name}'")
+    canonical = hit["label"]
 
+    console.log(f"Found WikiData: {canonical} ({qid})")
 
-        qid = hit["id"]
+    entity, summary = await asyncio.gather(_wd_entity(qid), _wiki_summary(canonical))
 
-        canonical = hit["label"]
+    description = summary or hit.get("description", "")
 
-        console.log(f"Found WikiData: {canonical} ({qid})")
+    website = _wd_official_site(entity)
 
-        entity = await _wd_entity(session, qid)
+    if not website and use_llm:
 
-        description = await _wiki_summary(session, canonical) or hit.get("description", "")
+        console.log("No official website in WikiData, trying web search...")
 
-        website = _wd_official_site(entity)
+        web_data = await _anthropic_web_search(name)
 
-        if not website and use_llm:
+        if web_data and web_data.get("website") != "Unknown":
 
-            console.log("No official website in WikiData, trying web search...")
+            website = web_data["website"]
 
-            web_data = await _anthropic_web_search(name)
+            console.log(f"Found website via web search: {website}")
 
-            if web_data and web_data.get("website") != "Unknown":
+    website = website or f"https://www.wikidata.org/wiki/{qid}"
 
-                website = web_data["website"]
+    sector, hq, p1037, p112 = await asyncio.gather(
 
-                console.log(f"Found website via web search: {website}")
+        _wd_first_claim_label(entity, "P452"),
 
-        website = website or f"https://www.wikidata.org/wiki/{qid}"
+        _wd_first_claim_label(entity, "P159"),
 
-        sector = await _wd_first_claim_label(session, entity, "P452") or "Unknown"
+        _wd_first_claim_label(entity, "P1037"),
 
-        hq = await _wd_first_claim_label(session, entity, "P159") or "Unknown"
+        _wd_first_claim_label(entity, "P112"),
 
-        key_people: List[str] = []
-        for prop in ("P1037", "P112"):
-            label = await _wd_first_claim_label(session, entity, prop)
-            if label and label not in key_people:
-                key_people.append(label)
-            if len(key_people) >= 3:
-                break
+    )
 
-        key_people_objs = _wrap_names(key_people)
+    sector = sector or "Unknown"
 
-        profile = {
+    hq = hq or "Unknown"
 
-            "name": canonical,
+    key_people: List[str] = []
+    for label in (p1037, p112):
+        if label and label not in key_people:
+            key_people.append(label)
+        if len(key_people) >= 3:
+            break
 
-            "aliases": [name] if _normalize(name) != _normalize(canonical) else [],
+    key_people_objs = _wrap_names(key_people)
 
-            "website": website,
+    profile = {
 
-            "sector": sector,
+        "name": canonical,
 
-            "hq_location": hq,
+        "aliases": [name] if _normalize(name) != _normalize(canonical) else [],
 
-            "description": description,
+        "website": website,
 
-            "key_people": key_people_objs,
+        "sector": sector,
 
-            "competitors": [],
+        "hq_location": hq,
 
-            "sources": {
+        "description": description,
 
-                "wikidata": f"https://www.wikidata.org/wiki/{qid}",
+        "key_people": key_people_objs,
 
-                "wikipedia": f"https://en.wikipedia.org/wiki/{quote_plus(canonical.replace(' ', '_'))}"
+        "competitors": [],
 
-            },
+        "sources": {
 
-        }
+            "wikidata": f"https://www.wikidata.org/wiki/{qid}",
 
-        console.log(f"Enriched '{name}' → '{canonical}' | website: {website}")
+            "wikipedia": f"https://en.wikipedia.org/wiki/{quote_plus(canonical.replace(' ', '_'))}"
 
-        return profile
+        },
+
+    }
+
+    console.log(f"Enriched '{name}' → '{canonical}' | website: {website}")
+
+    return profile
 
 
 if __name__ == "__main__":
@@ -419,6 +693,10 @@ if __name__ == "__main__":
 
             return
 
+        finally:
+
+            await close_client()
+
 
     args = sys.argv[1:]
 
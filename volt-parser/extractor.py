@@ -1,38 +1,244 @@
 from __future__ import annotations
+import contextlib
+import logging
+import os
 import re
-from typing import List
+from typing import Dict, Iterable, Iterator, List
+import numpy as np
 import spacy
+import torch
+from thinc.api import set_gpu_allocator
+from rapidfuzz import fuzz, process
 
-_nlp = spacy.load("en_core_web_trf")
+_log = logging.getLogger(__name__)
 
-_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)")
-_PUNCT_RE = re.compile(r"[',.\s]+$")
+try:
+    import re2 as _re2
+except ImportError:
+    _re2 = re
+
+# Only the NER output is used, so skip the components that would otherwise
+# run (and hold GPU memory) on every doc.
+_DISABLED = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+_BATCH_SIZE = 32
+SIM_THRESHOLD = 90
+_CHUNK_TOKENS = 400
+
+try:
+    _GPU = spacy.prefer_gpu()
+except Exception as exc:  # broken CUDA/cupy installs fail here, not at load
+    logging.warning("GPU unavailable, running spaCy on CPU: %s", exc)
+    _GPU = False
+
+if _GPU:
+    # Route cupy allocations through torch's caching allocator so the two
+    # libraries share one memory pool instead of fragmenting the device.
+    set_gpu_allocator("pytorch")
+
+# VOLT_DTYPE=fp16 turns on spacy-transformers' mixed precision: the weights
+# stay fp32 and the shim runs the forward pass under CUDA autocast, so the NER
+# head still receives fp32 arrays. GPU only.
+_DTYPE = os.getenv("VOLT_DTYPE", "fp32").lower()
+if _DTYPE not in ("fp32", "fp16"):
+    raise ValueError(f"VOLT_DTYPE must be 'fp32' or 'fp16', got {_DTYPE!r}")
+_CONFIG = {"components.transformer.model.mixed_precision": True} if _GPU and _DTYPE == "fp16" else {}
+
+# Set by extract_companies_many for its worker processes; see _worker_threads.
+if os.getenv("VOLT_TORCH_THREADS"):
+    torch.set_num_threads(int(os.environ["VOLT_TORCH_THREADS"]))
+
+_nlp = spacy.load("en_core_web_trf", disable=_DISABLED, config=_CONFIG)
+# Only ent.text/ent.label_ are read, so drop the transformer tensors that
+# would otherwise pin (GPU) memory for as long as a Doc is alive.
+_nlp.add_pipe("doc_cleaner", config={"attrs": {"tensor": None, "_.trf_data": None}})
+
+# Cheap rule-based sentence splitter used to chunk long inputs for the transformer.
+_sentencizer = spacy.blank("en")
+_sentencizer.add_pipe("sentencizer")
+
+# VOLT_BACKEND=onnx serves the RoBERTa backbone through ONNX Runtime.
+_ONNX = os.getenv("VOLT_BACKEND", "torch").lower() == "onnx"
+if _ONNX:
+    from .extractor_onnx import use_onnx
+    use_onnx(_nlp, gpu=_GPU)
+
+def _inference():
+    """Run the pipeline without recording an autograd tape."""
+    return torch.inference_mode()
+
+# RE2 matches in linear time without backtracking; the stdlib engine is the fallback.
+_LINK_RE = _re2.compile(r"\[([^\]]+)\]\([^)]*\)")
+# Curly apostrophe folded in the same C-level pass as the character mapping;
+# trailing punctuation/whitespace is removed with one rstrip.
+_TRANS = str.maketrans({"’": "'"})
+# Every str.isspace() character, i.e. what the old ``\s`` regex stripped; the
+# highest one is U+3000, so the scan stops there.
+_TRAILING = "',." + "".join(c for c in map(chr, range(0x3001)) if c.isspace())
 
 def _strip_markdown_links(text: str) -> str:
+    if "](" not in text:
+        return text
     return _LINK_RE.sub(r"\1", text)
 
 def _normalize(name: str) -> str:
-    name = name.replace("’", "'")
-    name = _PUNCT_RE.sub("", name.lower())
-    return name.strip()
-
-def _is_duplicate(name: str, acc: List[str]) -> bool:
-    norm = _normalize(name)
-    for existing in acc:
-        ex_norm = _normalize(existing)
-        if norm == ex_norm:
-            return True
-        if norm in ex_norm.split() or ex_norm in norm.split():
-            return True
-    return False
+    return name.translate(_TRANS).lower().rstrip(_TRAILING).lstrip()
+
+def _orgs(doc) -> List[str]:
+    return [ent.text.strip() for ent in doc.ents if ent.label_ == "ORG"]
+
+def _rapidfuzz_kernel() -> str:
+    """Which ``fuzz.ratio`` build rapidfuzz dispatched to at import."""
+    module = fuzz.ratio.__module__
+    if module.endswith("_avx2"):
+        return "avx2"
+    if module.startswith("rapidfuzz.fuzz_cpp"):
+        # Baseline C++ build: SSE2 on x86, NEON etc. elsewhere.
+        return "cpp"
+    return "pure-python"
+
+_KERNEL = _rapidfuzz_kernel()
+if _KERNEL == "pure-python":
+    _log.warning("rapidfuzz has no compiled extension; name dedup will be slow")
+else:
+    _log.debug("rapidfuzz dedup using %s kernels", _KERNEL)
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def dedupe_companies(candidates: Iterable[str]) -> List[str]:
+    """Keep the first spelling of every company, dropping near-duplicates.
+
+    Fuzzy matches (``fuzz.ratio`` >= ``SIM_THRESHOLD``, all pairs scored in
+    one ``process.cdist`` call) are grouped into connected components and only
+    the first member of each survives. Exact and single-word matches stay
+    greedy, as before: a candidate is only tested against names already kept,
+    so a dropped short name never links two unrelated companies.
+    """
+    names = list(candidates)
+    if len(names) < 2:
+        return names
+    # Normalise each candidate once; identical normal forms share one slot, so
+    # the pairwise pass below only sees distinct strings.
+    slot: Dict[str, int] = {}
+    norms: List[str] = []
+    owner: List[int] = []
+    for name in names:
+        norm = _normalize(name)
+        if norm not in slot:
+            slot[norm] = len(norms)
+            norms.append(norm)
+        owner.append(slot[norm])
+    tokens = [frozenset(n.split()) for n in norms]
+    scores = process.cdist(
+        norms, norms, scorer=fuzz.ratio, processor=None, score_cutoff=SIM_THRESHOLD,
+        dtype=np.uint8, workers=-1,
+    )
+    parent = list(range(len(norms)))
+    for i in range(len(norms)):
+        for j in np.flatnonzero(scores[i, :i]):
+            parent[_find(parent, i)] = _find(parent, int(j))
+    seen = set()
+    kept_norms: set = set()
+    kept_words: set = set()
+    kept: List[str] = []
+    for name, i in zip(names, owner):
+        root = _find(parent, i)
+        if root in seen:
+            continue
+        if norms[i] in kept_words or not tokens[i].isdisjoint(kept_norms):
+            continue
+        seen.add(root)
+        kept_norms.add(norms[i])
+        kept_words |= tokens[i]
+        kept.append(name)
+    return kept
+
+def _chunks(text: str) -> List[str]:
+    """Group sentences greedily into pieces of about ``_CHUNK_TOKENS`` subwords.
+
+    Keeps every transformer window short and lets ``nlp.pipe`` batch the
+    pieces of a long document together; subwords are estimated as chars / 4.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    for sent in _sentencizer(text).sents:
+        length = len(sent.text_with_ws) // 4
+        if current and size + length > _CHUNK_TOKENS:
+            chunks.append("".join(current))
+            current, size = [], 0
+        current.append(sent.text_with_ws)
+        size += length
+    if current:
+        chunks.append("".join(current))
+    return [c for c in chunks if c.strip()]
 
 def extract_companies(text: str) -> List[str]:
-    clean = _strip_markdown_links(text)
-    doc = _nlp(clean)
-    names: List[str] = []
-    for ent in doc.ents:
-        if ent.label_ == "ORG":
-            candidate = ent.text.strip()
-            if not _is_duplicate(candidate, names):
-                names.append(candidate)
-    return names
\ No newline at end of file
+    return next(extract_companies_many([text], n_process=1, batch_size=_BATCH_SIZE))
+
+@contextlib.contextmanager
+def _worker_threads(n_process: int) -> Iterator[None]:
+    """Split the cores between ``n_process`` workers instead of each using all.
+
+    Applied in this process before spaCy forks, and exported through
+    ``VOLT_TORCH_THREADS`` for spawn platforms, where every worker re-imports
+    this module and caps its threads before loading the model.
+    """
+    if n_process == 1:
+        yield
+        return
+    previous = torch.get_num_threads()
+    threads = max(1, (os.cpu_count() or 1) // n_process)
+    os.environ["VOLT_TORCH_THREADS"] = str(threads)
+    torch.set_num_threads(threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(previous)
+        os.environ.pop("VOLT_TORCH_THREADS", None)
+
+def extract_companies_many(
+    texts: Iterable[str], *, n_process: int = 1, batch_size: int = 16,
+) -> Iterator[List[str]]:
+    """Stream one name list per text through ``nlp.pipe``.
+
+    Each text is split into sentence chunks and the ORGs found in its chunks
+    are merged with ``dedupe_companies``. ``n_process > 1`` is an opt-in for
+    CPU runs: every worker holds its own copy of the transformer. GPU and ONNX
+    runs always use one process, since neither CUDA nor ORT survives a fork.
+    """
+    if _GPU or _ONNX:
+        n_process = 1
+    n_texts = 0
+
+    def _feed() -> Iterator[tuple]:
+        nonlocal n_texts
+        for text in texts:
+            for chunk in _chunks(_strip_markdown_links(text)):
+                yield chunk, n_texts
+            n_texts += 1
+
+    with _worker_threads(n_process):
+        docs = _nlp.pipe(_feed(), as_tuples=True, n_process=n_process, batch_size=batch_size)
+        current = 0
+        found: List[str] = []
+        while True:
+            with _inference():
+                item = next(docs, None)
+            if item is None:
+                break
+            doc, owner = item
+            while current < owner:
+                yield dedupe_companies(found)
+                found, current = [], current + 1
+            found.extend(_orgs(doc))
+        while current < n_texts:
+            yield dedupe_companies(found)
+            found, current = [], current + 1
+
+def extract_companies_batch(texts: List[str]) -> List[List[str]]:
+    """Run NER over many texts in one ``nlp.pipe`` call; one name list per text."""
+    return list(extract_companies_many(texts, n_process=1, batch_size=_BATCH_SIZE))
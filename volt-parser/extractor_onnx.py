@@ -0,0 +1,112 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, List
+import torch
+from transformers.modeling_outputs import BaseModelOutput
+from .cache import CACHE_PATH
+
+try:
+
+    import onnxruntime as ort
+    from onnxruntime.transformers import optimizer as ort_optimizer
+
+except ImportError:
+
+    ort = None
+
+
+ONNX_DIR = CACHE_PATH.parent
+
+_OPSET = 17
+
+
+class _Backbone(torch.nn.Module):
+    """Export wrapper: plain tensors in, ``last_hidden_state`` out."""
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        return self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+
+def _providers(gpu: bool) -> List[str]:
+    wanted = ["CUDAExecutionProvider", "CPUExecutionProvider"] if gpu else ["CPUExecutionProvider"]
+    available = ort.get_available_providers()
+    return [p for p in wanted if p in available]
+
+
+def onnx_path(nlp, *, gpu: bool = False) -> Path:
+    """Per model version and device: the optimised graph is hardware-specific."""
+    meta = nlp.meta
+    device = "gpu" if gpu else "cpu"
+    return ONNX_DIR / f"{meta['lang']}_{meta['name']}-{meta['version']}-{device}.onnx"
+
+
+def export(model: torch.nn.Module, path: Path, *, gpu: bool = False) -> Path:
+    """Export the RoBERTa backbone to ONNX and fuse attention/Gelu/LayerNorm."""
+    raw = path.with_suffix(".raw.onnx")
+    device = next(model.parameters()).device
+    dummy_ids = torch.ones((1, 16), dtype=torch.long, device=device)
+    dummy_mask = torch.ones_like(dummy_ids)
+    with torch.inference_mode():
+        torch.onnx.export(
+            _Backbone(model).float().eval(),
+            (dummy_ids, dummy_mask),
+            str(raw),
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "last_hidden_state": {0: "batch", 1: "seq"},
+            },
+            opset_version=_OPSET,
+        )
+    optimized = ort_optimizer.optimize_model(
+        str(raw),
+        model_type="bert",
+        num_heads=model.config.num_attention_heads,
+        hidden_size=model.config.hidden_size,
+        use_gpu=gpu,
+        opt_level=99,
+    )
+    optimized.save_model_to_file(str(path))
+    raw.unlink(missing_ok=True)
+    return path
+
+
+class OrtBackbone(torch.nn.Module):
+    """Drop-in for the HuggingFace model inside the spacy-transformers shim."""
+
+    def __init__(self, path: Path, config: Any, *, gpu: bool = False):
+        super().__init__()
+        self.config = config
+        self.session = ort.InferenceSession(str(path), providers=_providers(gpu))
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor, **_: Any) -> BaseModelOutput:
+        (hidden,) = self.session.run(
+            ["last_hidden_state"],
+            {
+                "input_ids": input_ids.cpu().numpy(),
+                "attention_mask": attention_mask.cpu().numpy(),
+            },
+        )
+        return BaseModelOutput(last_hidden_state=torch.from_numpy(hidden).to(input_ids.device))
+
+
+def use_onnx(nlp, *, gpu: bool = False) -> None:
+    """Swap the transformer backbone of *nlp* for an ONNX Runtime session."""
+    if ort is None:
+        raise RuntimeError("onnxruntime is not installed (pip install 'volt-parser[onnx]')")
+    path = onnx_path(nlp, gpu=gpu)
+    trf = nlp.get_pipe("transformer")
+    for node in trf.model.walk():
+        for shim in node.shims:
+            model = getattr(shim, "_model", None)
+            if not isinstance(model, torch.nn.Module):
+                continue
+            if not path.exists():
+                export(model, path, gpu=gpu)
+            shim._model = OrtBackbone(path, model.config, gpu=gpu)
@@ -1,16 +1,138 @@
 from __future__ import annotations
-import json
+from dataclasses import dataclass, field, fields
 from pathlib import Path
+import aiofiles
+import orjson
 from jsonschema import Draft202012Validator
 from .schema import schema
-from typing import Any, List
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+
+    import fastjsonschema
+
+except ImportError:
+
+    fastjsonschema = None
+
+try:
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+except ImportError:
+
+    pa = None
+
+    pq = None
+
+_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+Draft202012Validator.check_schema(schema)
+_VALIDATOR = Draft202012Validator(schema)
+# jsonschema treats "format" as an annotation; match it so both validators agree.
+_FAST_VALIDATE = fastjsonschema.compile(schema, use_formats=False) if fastjsonschema else None
+
+
+def _validate(data: Any) -> None:
+    """Fast generated validator first; jsonschema decides (and reports) on failure."""
+    if _FAST_VALIDATE is not None:
+        try:
+            _FAST_VALIDATE(data)
+            return
+        except fastjsonschema.JsonSchemaException:
+            pass
+    _VALIDATOR.validate(data)
+
+
+def validate_profile(profile: dict[str, Any]) -> None:
+    """Check one enriched profile against the item schema (raises ValidationError)."""
+    _validate([profile])
+
+
+def _encode(data: List[dict[str, Any]]) -> bytes:
+    return orjson.dumps(data, option=_OPTS)
 
 
 def write_json(data: List[dict[str, Any]], output: Path) -> None:
-    text = json.dumps(data, indent=2, ensure_ascii=False)
-    output.write_text(text, encoding="utf-8")
+    output.write_bytes(_encode(data))
+
+
+async def awrite_json(data: List[dict[str, Any]], output: Path) -> None:
+    payload = _encode(data)
+    async with aiofiles.open(output, "wb") as f:
+        await f.write(payload)
+
+
+class JsonlStream:
+    """Append-only JSON-Lines file for streaming partial results."""
+
+    def __init__(self, output: Path):
+        self.output = output
+        self._file: Optional[Any] = None
+
+    @property
+    def started(self) -> bool:
+        return self._file is not None
+
+    async def write(self, records: Iterable[dict[str, Any]]) -> None:
+        if self._file is None:
+            self._file = await aiofiles.open(self.output, "wb")
+        await self._file.write(b"".join(orjson.dumps(r) + b"\n" for r in records))
+        await self._file.flush()
+
+    async def aclose(self) -> None:
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
 
 
 def generate_json(companies: list[dict[str, Any]]) -> str:
-    Draft202012Validator(schema).validate(companies)
-    return json.dumps(companies, indent=2, ensure_ascii=False)
\ No newline at end of file
+    _validate(companies)
+    return orjson.dumps(companies, option=_OPTS).decode("utf-8")
+
+
+@dataclass
+class CompanyTable:
+    """Enriched profiles stored column-wise, one list per schema field."""
+
+    name: List[str] = field(default_factory=list)
+    aliases: List[List[str]] = field(default_factory=list)
+    website: List[str] = field(default_factory=list)
+    sector: List[str] = field(default_factory=list)
+    hq_location: List[str] = field(default_factory=list)
+    description: List[str] = field(default_factory=list)
+    key_people: List[List[Dict[str, str]]] = field(default_factory=list)
+    competitors: List[List[Dict[str, str]]] = field(default_factory=list)
+    sources: List[Dict[str, str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def append(self, profile: Dict[str, Any]) -> None:
+        self.name.append(profile["name"])
+        self.aliases.append(profile.get("aliases", []))
+        self.website.append(profile["website"])
+        self.sector.append(profile["sector"])
+        self.hq_location.append(profile["hq_location"])
+        self.description.append(profile["description"])
+        self.key_people.append(profile["key_people"])
+        self.competitors.append(profile["competitors"])
+        self.sources.append(profile.get("sources", {}))
+
+    def columns(self) -> Dict[str, list]:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def to_records(self, start: int = 0) -> List[Dict[str, Any]]:
+        cols = self.columns()
+        return [dict(zip(cols, row)) for row in zip(*(col[start:] for col in cols.values()))]
+
+    def to_arrow(self) -> "pa.Table":
+        if pa is None:
+            raise RuntimeError("pyarrow is not installed (pip install 'volt-parser[parquet]')")
+        return pa.Table.from_pydict(self.columns())
+
+
+def write_parquet(table: CompanyTable, output: Path) -> None:
+    arrow = table.to_arrow()  # raises RuntimeError without pyarrow
+    pq.write_table(arrow, output, compression="zstd")